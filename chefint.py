@@ -6,11 +6,227 @@
      (archived at https://web.archive.org/web/20220615003505/http://www.dangermouse.net/esoteric/chef.html)
 """
 
-import sys, re, random, copy, logging
+import sys, re, random, logging, functools, pathlib
 
 ## Global constants
 DEFAULT_BOWL = 1 # the default mixing bowl number
 DEFAULT_DISH = 1 # the default baking dish number
+DRY    = 0 # state of a dry value in a mixing bowl or baking dish
+LIQUID = 1 # state of a liquid value in a mixing bowl or baking dish
+_UNSET = object() # marks a lazily instantiated Chef property that has not been worked out yet
+
+## Precompiled regular expressions
+## These are compiled once, when the module is imported,
+##  rather than every time a recipe property is parsed.
+INGREDIENTS_HEADER   = "Ingredients.\n" # the declaration at the start of the ingredient list
+
+## The structural markers of a recipe, found together in a single scan of the script.
+## (?P<ingredients>^Ingredients\.\n): the ingredient list declaration, on a line of its own
+## (?P<method>^Method\.\n): the method declaration, on a line of its own
+## (?P<serves>^Serves (?P<servings>[0-9]+)): the optional Serves statement
+## (?P<bowls> (?:[2-9]|[1-9][0-9]+)(?:st|nd|rd|th) mixing bowl): a mixing bowl other than the 1st
+## (?P<dishes> (?:[2-9]|[1-9][0-9]+)(?:st|nd|rd|th) baking dish): a baking dish other than the 1st
+## Each alternative is a named group, so the scan can tell which one matched
+##  from the match's lastgroup.
+STRUCTURE_RE = re.compile(
+    r"(?P<ingredients>^Ingredients\.\n)|(?P<method>^Method\.\n)|(?P<serves>^Serves (?P<servings>[0-9]+))"
+    r"|(?P<bowls> (?:[2-9]|[1-9][0-9]+)(?:st|nd|rd|th) mixing bowl)"
+    r"|(?P<dishes> (?:[2-9]|[1-9][0-9]+)(?:st|nd|rd|th) baking dish)",
+    re.MULTILINE
+    )
+
+## A single, non-blank line of the method.
+## [^\S\n]*: Leading whitespace on the same line is skipped
+## ([^\n]*\S): The instruction, up to the last non-whitespace character on the line
+METHOD_LINE_RE = re.compile(r"[^\S\n]*([^\n]*\S)")
+
+## A single line of the ingredient list.
+## (?P<quantity>[0-9]*): There may or may not be an integer
+##  ?: There may or may not be a single whitespace
+## (?:(?P<liquid>m?l|dash(?:es)?|cups?)|(?P<dry>k?g|pinch(?:es)?|teaspoons?|tablespoons?))?: 
+    ## There may or may not be a unit of measure.
+    ## Liquid and dry units are in separate groups,
+    ##  so the match itself tells us which kind of ingredient this is.
+##  ?: There may or may not be a(nother) single whitespace
+## (?P<name>[a-zA-Z0-9 ]+): There needs to be an ingredinent name, which can contain whitespaces and numbers
+INGREDIENT_RE = re.compile(
+    "(?P<quantity>[0-9]*) ?(?:(?:(?P<liquid>m?l|dash(?:es)?|cups?)|(?P<dry>k?g|pinch(?:es)?|teaspoons?|tablespoons?)) )? ?(?P<name>[a-zA-Z0-9 ]+)\n"
+    )
+
+
+## Instructions in the method.
+## Each of these is matched against a line of the method in _decode_instruction().
+PUT_RE                = re.compile(r"Put (?:the )?([a-zA-Z ]+) into (?:the )?(?:([1-9]\d*(?:st|nd|rd|th)) )?mixing bowl") # `Put ingredient into [nth] mixing bowl.`
+FOLD_RE               = re.compile(r"Fold (?:the )?([a-zA-Z ]+) into (?:the )?(1st|2nd|3rd|[0-9]+th)? ?mixing bowl") # `Fold ingredient into [nth] mixing bowl.`
+ADD_RE                = re.compile(r"Add ([a-zA-Z0-9 ]+?) to (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl") # `Add ingredient [to [nth] mixing bowl].`
+REMOVE_RE             = re.compile(r"Remove ([a-zA-Z0-9 ]+?) from (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl") # `Remove ingredient [from [nth] mixing bowl].`
+COMBINE_RE            = re.compile(r"Combine ([a-zA-Z0-9 ]+?) into (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl") # `Combine ingredient [into [nth] mixing bowl].`
+DIVIDE_RE             = re.compile(r"Divide ([a-zA-Z0-9 ]+?) into (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl") # `Divide ingredient [into [nth] mixing bowl].`
+LIQUEFY_BOWL_RE       = re.compile(r"Liquefy contents of the (1st|2nd|3rd|[0-9]+th)? ?mixing bowl") # `Liquefy contents of the [nth] mixing bowl.`
+LIQUEFY_INGREDIENT_RE = re.compile(r"Liquefy ([a-zA-Z]+)") # `Liquefy ingredient.`
+CLEAN_RE              = re.compile(r"Clean (1st|2nd|3rd|[0-9]+th)? ?mixing bowl") # `Clean [nth] mixing bowl.`
+MIX_RE                = re.compile(r"Mix (the (1st|2nd|3rd|[0-9]+th)? ?mixing bowl )?well") # `Mix [the [nth] mixing bowl] well.`
+TAKE_RE               = re.compile(r"Take ([a-zA-Z ]+) from refrigerator") # `Take ingredient from refrigerator.`
+POUR_RE               = re.compile(r"Pour contents of the (?:the )?(?:([1-9]\d*(?:st|nd|rd|th)) )?mixing bowl"
+                                   r" into the (?:the )?(?:([1-9]\d*(?:st|nd|rd|th)) )?baking dish") # `Pour contents of the [nth] mixing bowl into the [pth] baking dish.`
+REFRIGERATE_RE        = re.compile(r"Refrigerate(?: for ([0-9]+) hours?)?\.") # `Refrigerate [for number hours].`
+ADD_DRY_RE            = re.compile(r"Add dry ingredients(?: to the (1st|2nd|3rd|[0-9]+th) mixing bowl)?") # `Add dry ingredients [to [nth] mixing bowl].`
+SERVE_WITH_RE         = re.compile(r"Serve with ([a-zA-Z ]+\.)") # `Serve with auxiliary-recipe.`
+STIR_RE               = re.compile(r"Stir(?: the (1st|2nd|3rd|[0-9]+th) mixing bowl)? for ([0-9]+) minutes?"
+                                   r"|Stir ([a-zA-Z0-9 ]+) into the (1st|2nd|3rd|[0-9]+th) mixing bowl") # `Stir [the [nth] mixing bowl] for number minutes.` or `Stir ingredient into the [nth] mixing bowl.`
+VERB_RE               = re.compile(r"([a-zA-Z]+) the ([a-zA-Z ]+)\.") # `Verb the ingredient.` (the start of a loop)
+
+
+def _ordinal(number)->str:
+    """
+    Write the integer <number> as an ordinal identifier, e.g. 3 becomes '3rd'.
+    11th, 12th and 13th take 'th' even though they end in 1, 2 and 3.
+    """
+    
+    if number % 100 in (11, 12, 13): return f"{number}th"
+    
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    
+    return f"{number}{suffix}"
+
+## The numbers of the first 64 mixing bowls and baking dishes,
+##  e.g. "1st": 1, "2nd": 2, "11th": 11, "21st": 21.
+ORDINALS = {_ordinal(number): number for number in range(1, 65)}
+
+def _ordinal_to_int(ordinal, default = DEFAULT_BOWL)->int:
+    """
+    Convert an ordinal identifier such as '3rd' into the integer 3.
+
+    Parameters
+    ----------
+    ordinal : str or None
+        Ordinal numeral e.g. 1st, 2nd, 3rd etc, as captured by a regex.
+        None if the instruction did not specify a bowl or dish.
+    default : int, optional
+        Value to return if no ordinal was supplied. The default is DEFAULT_BOWL.
+
+    Returns
+    -------
+    int
+        The bowl or dish number.
+
+    """
+    
+    ## No identifier means the recipe only has one of the relevant utensil.
+    if ordinal is None: return default
+    
+    ## Recipes rarely use more than a few dozen bowls and dishes,
+    ##  so look the common ordinals up directly.
+    number = ORDINALS.get(ordinal)
+    if number is not None: return number
+    
+    ## Otherwise chop off the 'st', 'nd', 'rd' or 'th' and keep the number.
+    return int(ordinal[:-2])
+
+@functools.lru_cache(maxsize=None)
+def _loop_end_regex(verb_past):
+    """
+    Compile the regex matching the end of a loop, e.g. '... until stirred.'
+    
+    The pattern depends on the loop's verb, so it can't be compiled
+     when the module is imported. Instead each one is compiled the first time
+     its verb is seen and cached, since a recipe only uses a handful of verbs.
+
+    Parameters
+    ----------
+    verb_past : str
+        Past tense of the loop's verb, in lower case, e.g. 'stirred'.
+
+    Returns
+    -------
+    re.Pattern
+        The compiled loop-ending regex.
+
+    """
+    
+    ## The verb is escaped, in case it contains any regex special characters.
+    return re.compile(f"([a-zA-Z]+) (the ([a-zA-Z ]+))? until {re.escape(verb_past)}\\.")
+
+@functools.lru_cache(maxsize=256)
+def _parse_ingredients(ingredients_text: str)->tuple:
+    """
+    Parse the raw text of an ingredient list.
+    
+    A sous-chef is hired every time an auxiliary recipe is called,
+     so the same ingredient list can be parsed many times in one run.
+    The result is cached on the text itself.
+    Because the Chef mutates ingredient quantities while cooking,
+     the cached result is immutable and each Chef builds its own dict from it.
+
+    Parameters
+    ----------
+    ingredients_text : str
+        The ingredient list as returned by Chef.ingredients_text.
+
+    Returns
+    -------
+    tuple
+        One (quantity, type, name) tuple per ingredient, in recipe order.
+
+    """
+    
+    parsed = []
+    
+    ## Step through the individual ingredients in a single scan of the text.
+    ## finditer() consumes the text from left to right, so each ingredient
+    ##  line is matched exactly once.
+    ## ingredients_text always starts with the 'Ingredients.' declaration,
+    ##  so we start the scan just after it rather than copying the rest of the text.
+    for ingredient in INGREDIENT_RE.finditer(ingredients_text, len(INGREDIENTS_HEADER)):
+        
+        ## Get the quantity, liquid unit of measure (if any) and name out of the match.
+        quantity, liquid_unit, name = ingredient.group("quantity", "liquid", "name")
+        
+        ## Dry or liquid? Check the unit of measure.
+        ##  Note that chr() is not run on values until output.
+        ##   This is to allow arithmetic operations on liquids.
+        ## There is a pre-defined set of liquid types,
+        ##  which the regex has already told apart from the dry ones.
+        ## The type is stored as the same DRY/LIQUID flag that bowls use,
+        ##  so no string comparison is needed when cooking.
+        if liquid_unit is not None:
+            ingredient_type = LIQUID
+        else:
+            ingredient_type = DRY
+        
+        ## The quantity is an integer, if there is one.
+        ## If there's no number there, the quantity is None.
+        ## This means the user will be prompted to input the quantity at runtime.
+        quantity = int(quantity) if quantity else None
+        
+        parsed.append((quantity, ingredient_type, name))
+    
+    return tuple(parsed)
+
+@functools.lru_cache(maxsize=256)
+def _parse_method(method_text: str)->tuple:
+    """
+    Split the raw text of a method into its instruction lines.
+    Cached for the same reason as _parse_ingredients().
+
+    Parameters
+    ----------
+    method_text : str
+        The method as returned by Chef.method_text.
+
+    Returns
+    -------
+    tuple
+        The instructions, in order.
+
+    """
+    
+    ## Start after the line holding the 'Method.' declaration.
+    ## Method lines inside loops are often indented, so each match
+    ##  captures the line without its surrounding whitespace,
+    ##  and every instruction begins with its keyword.
+    ## Blank lines don't match at all, so they are dropped.
+    return tuple(line.group(1) for line in METHOD_LINE_RE.finditer(method_text, method_text.find("\n") + 1))
 
 ## Configure logging
 logger = logging.getLogger("Chef")
@@ -23,12 +239,116 @@ logging.basicConfig(level=logging.INFO,
                     )
 
 
+class ChefParseError(ValueError):
+    """
+        The Chef script could not be understood: a syntax error.
+        Raised rather than exiting, so that a recipe can be loaded and cooked
+         from other Python code without killing the interpreter.
+    """
+
+class Bowl:
+    """
+        A mixing bowl or baking dish: an ordered stack of ingredient values.
+        The top of the stack is the end of the lists.
+        Values and their dry/liquid states are held in two parallel sequences,
+         so that arithmetic on the top value never has to touch its state.
+    """
+    
+    __slots__ = ("values", "states")
+    
+    def __init__(self,
+                 values = None,
+                 states = None
+                 ):
+        
+        ## The numerical values of the ingredients, bottom to top.
+        ## This is a plain list because Chef values can be arbitrarily large
+        ##  integers, and Divide produces floats.
+        self.values = values if values is not None else []
+        
+        ## One byte per value: DRY or LIQUID.
+        self.states = states if states is not None else bytearray()
+    
+    def __len__(self)->int:
+        return len(self.values)
+    
+    def push(self, value, state)->None:
+        """
+        Place a value on top of the stack.
+        """
+        
+        self.values.append(value)
+        self.states.append(state)
+    
+    def pop(self)->tuple:
+        """
+        Remove the top value from the stack and return it with its state.
+        """
+        
+        return self.values.pop(), self.states.pop()
+    
+    def extend(self, other)->None:
+        """
+        Place the contents of another bowl or dish on top of this one,
+         retaining their order.
+        """
+        
+        self.values.extend(other.values)
+        self.states.extend(other.states)
+    
+    def copy(self)->"Bowl":
+        """
+        Return a new bowl or dish with the same contents,
+         which can be changed without affecting this one.
+        """
+        
+        return Bowl(self.values[:], self.states[:])
+    
+    def roll(self, depth)->None:
+        """
+        Move the top value down <depth> places, so that the values
+         above its new position each rise one place.
+        If there are fewer than <depth> values beneath it,
+         it goes to the bottom.
+        Rolling by 0 leaves the stack unchanged.
+        """
+        
+        if depth <= 0 or not self.values: return
+        
+        ## Inserting at -depth only moves the <depth> values above the
+        ##  insertion point, so this costs the depth of the roll,
+        ##  not the size of the whole stack.
+        value, state = self.pop()
+        self.values.insert(-depth, value)
+        self.states.insert(-depth, state)
+
+
 class Chef:
     """
         Contains recipes and is able to cook them by parsing methods.
         Calls instances of itself to hold and cook auxiliary recipes.
     """
     
+    __slots__ = ("_script", "mixing_bowls", "baking_dishes",
+                 "cooked", "refrigerated", "current_instruction_line",
+                 ## Lazily instantiated properties. See below.
+                 "_recipename", "_comment", "_ingredients_text", "_ingredients",
+                 "_method_text", "_method", "_serves_count",
+                 "_has_multiple_bowls", "_has_multiple_dishes", "_auxiliary_recipes",
+                 "_ingredients_start", "_method_start", "_loops",
+                 "_rng", "_program", "_sous_chefs"
+                 )
+    
+    ## The slots that depend only on the text of the recipe, not on cooking it.
+    ## A new sous-chef for an auxiliary recipe copies these from the first
+    ##  sous-chef that cooked it, rather than parsing the recipe again.
+    ## _ingredients is not among them, because the ingredient values change as we cook.
+    _RECIPE_SLOTS = ("_recipename", "_comment", "_ingredients_text",
+                     "_method_text", "_method", "_program", "_serves_count",
+                     "_has_multiple_bowls", "_has_multiple_dishes", "_auxiliary_recipes",
+                     "_ingredients_start", "_method_start", "_loops", "_sous_chefs"
+                     )
+    
     def __init__(self, 
                  script, 
                  mixing_bowls = None,
@@ -39,17 +359,51 @@ class Chef:
         ## The script of this recipe.
         self._script         = script
         
+        ## Nothing has been parsed yet.
+        ## Each lazy property fills in its slot the first time it is asked for.
+        self._recipename          = _UNSET
+        self._comment             = _UNSET
+        self._ingredients_text    = _UNSET
+        self._ingredients         = _UNSET
+        self._method_text         = _UNSET
+        self._method              = _UNSET
+        self._serves_count        = _UNSET
+        self._has_multiple_bowls  = _UNSET
+        self._has_multiple_dishes = _UNSET
+        self._auxiliary_recipes   = _UNSET
+        self._ingredients_start   = _UNSET
+        self._method_start        = _UNSET
+        self._program             = _UNSET
+        
         ## If this is an auxiliary recipe, we inherit mixing bowls and baking dishes
         ##  from the calling recipe.
         ## The calling method should have already created copies of these,
         ##  so we are free to change them at will.
         
-        self.mixing_bowls    = mixing_bowls if mixing_bowls else {DEFAULT_BOWL: []}
-        self.baking_dishes   = baking_dishes if baking_dishes else {DEFAULT_DISH: []}
+        self.mixing_bowls    = mixing_bowls if mixing_bowls else {DEFAULT_BOWL: Bowl()}
+        self.baking_dishes   = baking_dishes if baking_dishes else {DEFAULT_DISH: Bowl()}
         
         ## Initialise boolean to say whether the meal is cooked and/or refrigerated.
         self.cooked = False
         self.refrigerated = False
+        
+        ## We haven't started cooking, so we aren't on any line of the method yet.
+        ## cook() sets this to 0 when it begins.
+        self.current_instruction_line = -1
+        
+        ## The loops in the method, found as they are first reached.
+        ## Keys are the line numbers where loops begin,
+        ##  values are (lines in the loop, ingredient decremented at the end of each pass).
+        self._loops = {}
+        
+        ## Each chef has their own random number generator for mixing,
+        ##  rather than sharing the module-level one.
+        ## Seed it (e.g. `chef._rng.seed(0)`) to make Mix deterministic.
+        self._rng = random.Random()
+        
+        ## The first sous-chef hired for each auxiliary recipe, by recipe name.
+        ## Later sous-chefs for the same recipe reuse what it has parsed.
+        self._sous_chefs = {}
     
     def initialise(self)->None:
         """
@@ -62,8 +416,8 @@ class Chef:
 
         """
         
-        self.mixing_bowls    = {DEFAULT_BOWL: []}
-        self.baking_dishes   = {DEFAULT_DISH: []}
+        self.mixing_bowls    = {DEFAULT_BOWL: Bowl()}
+        self.baking_dishes   = {DEFAULT_DISH: Bowl()}
         
         ## Initialise boolean to say whether the meal is cooked and/or refrigerated.
         self.cooked = False
@@ -78,15 +432,14 @@ class Chef:
         error_msg = f"Syntax error in {self.recipename}"
         
         ## Add the line number, if it's in the method
-        if hasattr(self, "current_instruction_line"):
+        if self.current_instruction_line >= 0:
             
             error_msg += f" Method line {self.current_instruction_line}."
         
         ## Report the actual message
         error_msg += f" Message: {message}"
         
-        logger.error(error_msg)
-        sys.exit(-1)
+        raise ChefParseError(error_msg)
     
     def runtime_error(self,message)->None:
         """
@@ -98,41 +451,72 @@ class Chef:
             Information about the error.
         """
         
-        logger.error(f"Runtime error on line {self.current_instruction_line}: {message}")
+        logger.error("Runtime error on line %d: %s", self.current_instruction_line, message)
         sys.exit(-1)
     
     def cook(self,debug=False)->None:
         """
         Step through the recipe's Method and execute each line.
+        
+        Parameters
+        ----------
+        debug : bool, optional
+            If True, log each instruction as it is executed.
+            This sets the Chef logger to show debug messages while cooking,
+             and puts its previous level back afterwards.
+            The default is False.
         """
         
+        ## Debug messages are only wanted for this cook,
+        ##  so lower the logger's level and make sure it is put back,
+        ##  even if cooking stops with an error.
+        if debug:
+            previous_level = logger.level
+            logger.setLevel(logging.DEBUG)
+            try:
+                return self.cook()
+            finally:
+                logger.setLevel(previous_level)
+        
         ## Initialise
         if self.cooked: self.initialise()
         
+        ## Tracing is on if the logger is showing debug messages.
+        ## Check once here, rather than on every instruction.
+        trace = logger.isEnabledFor(logging.DEBUG)
+        
         ## We use a global counter to remember where we are in the recipe.
         ## This helps when jumping into and out of loops and error reporting.
         ## Initialise the index before starting to cook.
         self.current_instruction_line = 0
         
+        ## The method doesn't change while we cook,
+        ##  so look it up and measure it just once.
+        method = self.method
+        method_length = len(method)
+        run_line = self.run_line
+        
         ## Begin cooking, stepping through the lines one at a time.
         ## As long as our current instruction line exists,
         ##  we will continue to cook.
-        while self.current_instruction_line < len(self.method):
+        while self.current_instruction_line < method_length:
             
             ## Get the current instruction.
-            ## This is a string, <instruction>, within the list, <self.method>.
-            instruction = self.method[self.current_instruction_line]
+            ## This is a string, <instruction>, within the list, <method>.
+            instruction = method[self.current_instruction_line]
             
             ## DEBUG
-            if debug: print(f"Executing: {instruction}")
+            ## The message is only formatted if it is going to be logged.
+            if trace: logger.debug("Executing: %s", instruction)
             
-            ## Parse and execute this instruction.
-            self.parse_instruction(instruction)
+            ## Execute this instruction.
+            ## It was decoded once, before cooking; see the program property.
+            run_line(self.current_instruction_line)
             
             ## Increment the current instruction index.
             ## So long as there were no loops, this will just become
             ##  1 higher than the previous iteration of the while-loop.
-            ## parse_instruction() handles loops so that when a loop completes,
+            ## The loop handlers called from run_line() make sure that when a loop completes,
             ##  self.current_instruction_line is the final line of the loop
             ##  (i.e. Verb [the ingredient] until verbed.)
             ## Therefore adding 1 to it here is correct, as it means we will
@@ -165,33 +549,35 @@ class Chef:
         ## The instruction `Set aside.` will cause this loop to immediately terminate.
         set_aside = False        
         
+        ## The final line of the loop, i.e. `Verb [the ingredient] until verbed.`
+        ## Work it out once here rather than on every line of every pass.
+        last_line = max(method_lines)
+        
+        ## Bind the ingredients dict and the line runner to local names,
+        ##  so each pass of the loop doesn't look them up on self again.
+        ingredients = self.ingredients
+        run_line = self.run_line
+        
+        ## Ingredient records are only ever changed in place,
+        ##  so hold on to the ones this loop checks and decrements
+        ##  rather than looking them up by name on every pass.
+        start_slot = ingredients[ingredient_name_start]
+        dec_slot = ingredients[ingredient_name_end] if ingredient_name_end is not None else None
+        
         ## Only enter the loop if the ingredient value is non-zero.
-        while self.ingredients[ingredient_name_start][0] != 0:
-            
-            # print(f"Start: {ingredient_name_start}") # debug
-            # print(self.ingredients[ingredient_name_start][0]) # debug
-            # print(f"End: {ingredient_name_end}") # debug
-            # print(self.ingredients[ingredient_name_end][0]) # debug
+        while start_slot[0] != 0:
             
             ## Run through the entire loop (unless `Set aside.` is encountered.)
-            for line_number, instruction in method_lines.items():
+            for line_number in method_lines:
                 
                 ## Set current line number.
                 self.current_instruction_line = line_number
                 
-                ## Debug
-                # print(f"In loop: Executing {instruction}")
-                
                 ## Is this the final line of the loop?
-                if line_number == max(method_lines.keys()): break
+                if line_number == last_line: break
                 
                 ## Execute current instruction.
-                set_aside = self.parse_instruction(instruction)
-                
-                ## debug
-                if str(self.ingredients[ingredient_name_start][0]) == "nan":
-                    print(f"Broke on line {line_number}: {instruction}")
-                    sys.exit(-1)
+                set_aside = run_line(line_number)
                 
                 ## `Set aside.` causes the loop to end immediately.
                 if set_aside: break
@@ -201,10 +587,8 @@ class Chef:
         
             ## "If the ingredient appears in this statement, 
             ##   its value is decremented by 1 when this statement executes."
-            if ingredient_name_end is not None:
-                self.ingredients[ingredient_name_end][0] -= 1
-            
-            # print(self.ingredients[ingredient_name_start][0]) # debug
+            if dec_slot is not None:
+                dec_slot[0] -= 1
         
         ## If this recipe has been refrigerated,
         ##  tell any outer loops we may be in that they can "Set aside"
@@ -213,7 +597,7 @@ class Chef:
         
         ## If the meal hasn't been refrigerated, 
         ##  set the current line index to the final line number of this loop.
-        self.current_instruction_line = list(method_lines.keys())[-1]
+        self.current_instruction_line = last_line
     
     def serve(self,
               number_of_servings = None
@@ -226,57 +610,52 @@ class Chef:
         The Serves statement is optional, but is required if the recipe is to output anything!
         """
         
-        ## Find the Serves statement.
-        serves = re.search("Serves ([0-9]+).", self.script)
+        ## The number of people to serve is either the argument <number_of_servings>
+        ##  or the number in the Serves statement.
+        if not number_of_servings: number_of_servings = self.serves_count
         
-        if serves == None:
+        if not number_of_servings:
             ## The serves statement is optional. If it doesn't exist, don't do anything.
             return
         
-        ## The number of people to serve is either the argument <number_of_servings>
-        ##  or the number in the statement.
-        if not number_of_servings: number_of_servings = int(serves.group(1))
-        
         ## If we don't have that many baking dishes, we will just output all of them.
         if number_of_servings > len(self.baking_dishes):
             
             ## Warn the user.
-            logger.warning("{number_of_servings} baking dishes requested but only {len(self.baking_dishes)} available.")
+            logger.warning("%d baking dishes requested but only %d available.", number_of_servings, len(self.baking_dishes))
             
             ## Just output the baking dishes we actually have.
             number_of_servings = len(self.baking_dishes)
         
+        ## Collect the output and write it in one go at the end,
+        ##  rather than printing each value separately.
+        output = []
+        
         ## Loop through all baking dishes and output the contents of each, in order.
         ## We index dishes from 1, for consistency with the Chef language specification.
         for i in range(DEFAULT_BOWL, number_of_servings + DEFAULT_BOWL):
             
-            ## Because of the way we are stacking objects in lists,
-            ##  the FINAL element of the list is the FIRST ingredient in the dish.
+            ## Because of the way we are stacking values in lists,
+            ##  the FINAL element of each list is the FIRST ingredient in the dish.
             ## So we are going to output elenents from the end to the beginning.
-            ## In order to do that efficiently, we use *extended slice syntax*.
-            ## It works by doing [begin:end:step].
-            ## By leaving begin and end blank and specifying a step of -1,
-            ##  it reverses a string.
-            ## (Starts at the very beginning, ends at the very end, but steps "backwards".)
-            ## See https://stackoverflow.com/questions/931092/reverse-a-string-in-python
-             
-            for j in self.baking_dishes[i][::-1]:
-                
-                ## Get the value of this ingredient
-                value = j[0]
+            ## In order to do that efficiently, we use reversed().
+            ## It steps backwards through the list without making a reversed copy of it.
+            
+            dish = self.baking_dishes[i]
+            
+            for value, state in zip(reversed(dish.values), reversed(dish.states)):
                 
                 ## If it's liquid, we are treating the integer value as a character value.
-                if j[1] == "liquid":
-                    value = chr(value)
-                
-                ## Output the value of this ingredient to STDOUT
-                print(value)
+                ## Each value goes on its own line.
+                output.append(chr(value) if state == LIQUID else str(value))
+        
+        ## Output the values of all the ingredients to STDOUT
+        if output: sys.stdout.write("\n".join(output) + "\n")
     
     
     def parse_instruction(self, instruction)->bool:
         """
-            Main interpreting function.
-            Check the text line <instruction> for what action to take.
+            Decode and run the single text line <instruction>.
             
         Returns
         -------
@@ -284,468 +663,501 @@ class Chef:
             Whether the `Set aside.` instruction was encountered.
         """
         
+        ## Work out which instruction this is.
+        ## The same line is usually executed many times, e.g. in a loop
+        ##  or by every sous-chef cooking the same auxiliary recipe,
+        ##  so the result is cached; see _decode_instruction().
+        decoded = self._decode_instruction(instruction)
+        
+        ## If nothing matched, no recognisable instruction was found.
+        ## That's a syntax error.
+        if decoded is None: self.syntax_error(f"Instruction not recognised: {instruction}")
+        
+        ## Carry out the instruction, and return,
+        ##  so the calling method can move to the next instruction.
+        handler, groups = decoded
+        return handler(self, groups)
+    
+    def run_line(self, line_number)->bool:
+        """
+            Carry out line <line_number> of the method,
+             using the already-decoded program rather than the text of the line.
+            
+        Returns
+        -------
+        bool
+            Whether the `Set aside.` instruction was encountered.
+        """
+        
+        decoded = self.program[line_number]
+        
+        ## The line was not a recognisable instruction.
+        if decoded is None: self.syntax_error(f"Instruction not recognised: {self.method[line_number]}")
+        
+        handler, groups = decoded
+        return handler(self, groups)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _decode_instruction(instruction)->tuple:
+        """
+        Work out which instruction a line of the method is,
+         without carrying it out.
+        
+        The result only depends on the text of the line,
+         so it is cached and each distinct line is only matched against the regexes once.
+
+        Parameters
+        ----------
+        instruction : str
+            A line of the method.
+
+        Returns
+        -------
+        tuple or None
+            (handler, groups): the method that carries out the instruction,
+             and the groups of the regex match to pass to it.
+            The groups are taken out of the match here, once,
+             so each execution of the line reuses the same strings.
+            Bowl and dish ordinals such as '3rd' are already converted to ints;
+             a bowl or dish that wasn't specified is left as None.
+            None if the instruction was not recognised.
+
+        """
+        
         ## `Set aside.`
         ## 'This causes execution of the innermost loop in which it occurs 
         ##   to end immediately and execution to continue at the statement 
         ##   after the "until".'
         ## Should be an exact match.
         if instruction == "Set aside.":
-            return True
+            return Chef._handle_set_aside, ()
         
         
         ## INTERPRETING THE INSTRUCTION
-        ## For each possible instruction we will use a regex
-        ##  to determine whether the current line is an instance
-        ##  of that instruction.
+        ## Every keyword instruction begins with a fixed word.
+        ## We look that word up in a table of the instructions that begin with it,
+        ##  so only their regexes are tried rather than every regex in turn.
+        ## The first regex that matches is paired with the method that carries out the instruction.
+        for regex, handler, ordinal_groups in Chef._KEYWORD_HANDLERS.get(instruction.partition(" ")[0], ()):
+            
+            ## See if the current line fits this regex.
+            match = regex.search(instruction)
+            
+            if match != None: 
+                
+                ## Work out the bowl and dish numbers now,
+                ##  rather than every time the line is executed.
+                ## Only the groups that hold a bowl or dish are converted,
+                ##  as ingredient names may contain digits too.
+                groups = list(match.groups())
+                for index in ordinal_groups:
+                    if groups[index] is not None: groups[index] = _ordinal_to_int(groups[index])
+                
+                return handler, tuple(groups)
         
-        ## A. Put
-        ##  `Put ingredient into [nth] mixing bowl.`
-        ## This puts the ingredient into the nth mixing bowl.
-        ## Create the regex.
-        put_regex = "Put (?:the )?([a-zA-Z ]+) into (?:the )?(?:([1-9]\d*)(?:st|nd|rd|th) )?mixing bowl"
         
-        ## See if the current line fits this regex.
-        put = re.search(put_regex, instruction)
+        ## No standard keyword: look for a verb to begin a loop.
+        ## Note that a loop verb may also be a keyword, e.g. `Stir the sugar.`,
+        ##  so this is checked even if the first word was in the table.
+        verb_search = VERB_RE.search(instruction)
         
-        ## If the regex search returned something...
-        if put != None:
-            
-            ## ...call the put() method...
-            self.put(
-                ingredient = put.group(1), 
-                mixingbowl = int(put.group(2))
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        if verb_search != None: return Chef._handle_loop, verb_search.groups()
+        
+        ## Not recognised.
+        return None
+    
+    def _bowl_number(self, number)->int:
+        """
+        The mixing bowl <number> given by an instruction,
+         or the 1st mixing bowl if the instruction didn't give one.
+        Leaving the number out is only allowed if the recipe uses a single mixing bowl.
+        """
+        
+        if number is not None: return number
+        
+        if self.has_multiple_bowls: self.syntax_error("Bowl number unspecified.")
+        
+        return DEFAULT_BOWL
+    
+    def _dish_number(self, number)->int:
+        """
+        The baking dish <number> given by an instruction,
+         or the 1st baking dish if the instruction didn't give one.
+        Leaving the number out is only allowed if the recipe uses a single baking dish.
+        """
         
+        if number is not None: return number
+        
+        if self.has_multiple_dishes: self.syntax_error("Dish number unspecified.")
+        
+        return DEFAULT_DISH
+    
+    def _handle_set_aside(self, groups)->bool:
+        """
+        `Set aside.`
+        Tell the loop we are in to end.
+        """
+        
+        return True
+    
+    def _handle_put(self, put)->None:
+        """
+        `Put ingredient into [nth] mixing bowl.`
+        <put> holds the groups of PUT_RE matched against the instruction.
+        """
+        
+        ## This puts the ingredient into the nth mixing bowl.
+        
+        ## ...call the put() method...
+        self.put(
+            ingredient = put[0], 
+            mixingbowl = DEFAULT_BOWL if put[1] is None else put[1]
+            )
+        
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_fold(self, fold)->None:
+        """
+        `Fold ingredient into [nth] mixing bowl.`
+        <fold> holds the groups of FOLD_RE matched against the instruction.
+        """
         
-        ## B. Fold
-        ##  `Fold ingredient into [nth] mixing bowl.`
         ## This removes the top value from the nth mixing bowl 
         ##  and places it in the ingredient.
-        ## Create the regex.
-        fold_regex = "Fold (?:the )?([a-zA-Z ]+) into (?:the )?(1st|2nd|3rd|[0-9]+th)? ?mixing bowl"
         
-        ## See if the current line fits this regex.
-        fold = re.search(fold_regex, instruction)
-        
-        ## If the regex search returned something...
-        if fold != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if fold.group(2) == None and self.has_multiple_bowls:
-                self.syntax_error("Bowl number unspecified.") 
-            
-            ## ...call the fold() method...
-            self.fold(
-                ingredient = fold.group(1), 
-                mixingbowl = int(fold.group(2)[:-2])
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the fold() method...
+        self.fold(
+            ingredient = fold[0], 
+            mixingbowl = self._bowl_number(fold[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_add(self, add)->None:
+        """
+        `Add ingredient [to [nth] mixing bowl].`
+        <add> holds the groups of ADD_RE matched against the instruction.
+        """
         
-        ## C. Add
-        ##  `Add ingredient [to [nth] mixing bowl].`
         ## This adds the value of <ingredient> to the value of the ingredient 
         ##  on top of the nth mixing bowl and stores the result in the nth mixing bowl.
-        ## Create the regex.
-        add_regex = "Add ([a-zA-Z0-9 ]+?) to (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl"
-        
-        ## See if the current line fits this regex.
-        add = re.search(add_regex, instruction)
         
-        ## If the regex search returned something...
-        if add != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if add.group(2) == None and self.has_multiple_bowls:
-                self.syntax_error("Bowl number unspecified.") 
-            
-            ## ...call the addingredient() method...
-            self.addingredient(
-                ingredient = add.group(1), 
-                mixingbowl = int(add.group(2)[:-2])
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the addingredient() method...
+        self.addingredient(
+            ingredient = add[0], 
+            mixingbowl = self._bowl_number(add[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_remove(self, remove)->None:
+        """
+        `Remove ingredient [from [nth] mixing bowl].`
+        <remove> holds the groups of REMOVE_RE matched against the instruction.
+        """
         
-        ## D. Remove
-        ##  `Remove ingredient [from [nth] mixing bowl].`
         ## This subtracts the value of <ingredient> from the value of the ingredient 
         ##  on top of the nth mixing bowl and stores the result in the nth mixing bowl.
-        ## Create the regex.
-        remove_regex = "Remove ([a-zA-Z0-9 ]+?) from (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl"
         
-        ## See if the current line fits this regex.
-        remove = re.search(remove_regex, instruction)
-        
-        ## If the regex search returned something...
-        if remove != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if remove.group(2) == None and self.has_multiple_bowls:
-                self.syntax_error("Bowl number unspecified.") 
-            
-            ## ...call the removeingredient() method...
-            self.removeingredient(
-                ingredient = remove.group(1), 
-                mixingbowl = int(remove.group(2)[:-2])
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the removeingredient() method...
+        self.removeingredient(
+            ingredient = remove[0], 
+            mixingbowl = self._bowl_number(remove[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_combine(self, combine)->None:
+        """
+        `Combine ingredient [into [nth] mixing bowl].`
+        <combine> holds the groups of COMBINE_RE matched against the instruction.
+        """
         
-        ## E. Combine
-        ##  `Combine ingredient [into [nth] mixing bowl].`
         ## This multiplies the value of <ingredient> by the value of the ingredient 
         ##  on top of the nth mixing bowl and stores the result in the nth mixing bowl.
-        ## Create the regex.
-        combine_regex = "Combine ([a-zA-Z0-9 ]+?) into (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl"
-        
-        ## See if the current line fits this regex.
-        combine = re.search(combine_regex, instruction)
         
-        ## If the regex search returned something...
-        if combine != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if combine.group(2) == None and self.has_multiple_bowls:
-                self.syntax_error("Bowl number unspecified.")
-            
-            ## ...call the combineingredient() method...
-            self.combineingredient(
-                ingredient = combine.group(1), 
-                mixingbowl = int(combine.group(2)[:-2])
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the combineingredient() method...
+        self.combineingredient(
+            ingredient = combine[0], 
+            mixingbowl = self._bowl_number(combine[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_divide(self, divide)->None:
+        """
+        `Divide ingredient [into [nth] mixing bowl].`
+        <divide> holds the groups of DIVIDE_RE matched against the instruction.
+        """
         
-        ## F. Divide
-        ##  `Divide ingredient [into [nth] mixing bowl].`
         ## This divides the value of <ingredient> into the value of the ingredient 
         ##  on top of the nth mixing bowl and stores the result in the nth mixing bowl.
-        ## Create the regex.
-        divide_regex = "Divide ([a-zA-Z0-9 ]+?) into (?:the )?(?:(1st|2nd|3rd|[0-9]+th) )?mixing bowl"
         
-        ## See if the current line fits this regex.
-        divide = re.search(divide_regex, instruction)
-        
-        ## If the regex search returned something...
-        if divide != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if divide.group(2) == None and self.has_multiple_bowls:
-                self.syntax_error("Bowl number unspecified.")
-            
-            ## ...call the divideingredient() method...
-            self.divideingredient(
-                ingredient = divide.group(1), 
-                mixingbowl = int(divide.group(2)[:-2])
-                )
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the divideingredient() method...
+        self.divideingredient(
+            ingredient = divide[0], 
+            mixingbowl = self._bowl_number(divide[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_liquefy_bowl(self, liquefy_bowl)->None:
+        """
+        `Liquefy contents of the [nth] mixing bowl.`
+        <liquefy_bowl> holds the groups of LIQUEFY_BOWL_RE matched against the instruction.
+        """
         
-        ## G. Liquefy mixing bowl
-        ##  `Liquefy contents of the [nth] mixing bowl.`
         ## This turns all the ingredients in the nth mixing bowl into a liquid, 
         ##  i.e. a Unicode characters for output purposes.
-        ## Create the regex.
-        liquefy_bowl_regex = "Liquefy contents of the (1st|2nd|3rd|[0-9]+th)? ?mixing bowl"
         
-        ## See if the current line fits this regex.
-        liquefy_bowl = re.search(liquefy_bowl_regex, instruction)
+        ## ...explicitly define the bowl number...
+        bowl_number = self._bowl_number(liquefy_bowl[0])
         
-        ## If the regex search returned something...
-        if liquefy_bowl != None:             
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if liquefy_bowl.group(1) == None and self.has_multiple_bowls:                    
-                self.syntax_error("Bowl number unspecified.")
-            
-            ## ...explicitly define the bowl number...
-            bowl_number = int(liquefy_bowl.group(1)[:-2]) if liquefy_bowl.group(1) is not None else DEFAULT_BOWL
-            
-            ## ...convert every ingredient in the bowl to liquid...
-            for ingredient in self.mixing_bowls[bowl_number]:                    
-                ingredient[1] = "liquid"                            
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...convert every ingredient in the bowl to liquid...
+        bowl = self.mixing_bowls[bowl_number]
+        bowl.states[:] = bytes([LIQUID]) * len(bowl)
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_liquefy_ingredient(self, liquefy_ingredient)->None:
+        """
+        `Liquefy ingredient.`
+        <liquefy_ingredient> holds the groups of LIQUEFY_INGREDIENT_RE matched against the instruction.
+        """
         
-        ## H. Liquefy ingredient.
-        ##  `Liquefy ingredient.`
         ## This turns the ingredient into a liquid, 
         ##  i.e. a Unicode character for output purposes.
-        ## Create the regex.
-        liquefy_ingredient = "Liquefy ([a-zA-Z]+)"
         
-        ## See if the current line fits this regex.
-        liquefy_ingredient = re.search(liquefy_ingredient, instruction)
-        
-        ## If the regex search returned something...
-        if liquefy_ingredient != None:
-            
-            ## ...set this ingredient's state to liquid...
-            self.ingredients[liquefy_ingredient.group(1)][1] = "liquid"
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...set this ingredient's state to liquid...
+        self.ingredients[liquefy_ingredient[0]][1] = LIQUID
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_clean(self, clean)->None:
+        """
+        `Clean [nth] mixing bowl.`
+        <clean> holds the groups of CLEAN_RE matched against the instruction.
+        """
         
-        ## I. Clean mixing bowl
-        ##  `Clean [nth] mixing bowl.`
         ## This removes all the ingredients from the nth mixing bowl.
-        ## Create the regex.
-        clean_regex = "Clean (1st|2nd|3rd|[0-9]+th)? ?mixing bowl"
         
-        ## See if the current line fits this regex.
-        clean = re.search(clean_regex, instruction)
+        ## ...explicitly define the bowl number...
+        bowl_number = self._bowl_number(clean[0])
         
-        ## If the regex search returned something...
-        if clean != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if clean.group(1) == None and self.has_multiple_bowls:                    
-                self.syntax_error("Bowl number unspecified.")
-            
-            ## ...explicitly define the bowl number...
-            bowl_number = int(clean.group(1)[:-2]) if clean.group(1) is not None else DEFAULT_BOWL
-            
-            ## ...remove all ingredients from that bowl...
-            self.mixing_bowls[bowl_number] = []
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...remove all ingredients from that bowl...
+        self.mixing_bowls[bowl_number] = Bowl()
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_mix(self, mix)->None:
+        """
+        `Mix [the [nth] mixing bowl] well.`
+        <mix> holds the groups of MIX_RE matched against the instruction.
+        """
         
-        ## J. Mix mixing bowl
-        ##  `Mix [the [nth] mixing bowl] well.`
         ## This randomises the order of the ingredients in the nth mixing bowl.
-        ## Create the regex.
-        mix_regex = "Mix (the (1st|2nd|3rd|[0-9]+th)? ?mixing bowl )?well"
-        
-        ## See if the current line fits this regex.
-        mix = re.search(mix_regex, instruction)
         
-        ## If the regex search returned something...
-        if mix != None:
-            
-            ## ...ensure that if the bowl number wasn't specified, there is only one bowl...
-            if mix.group(2) == None and self.has_multiple_bowls:                    
-                self.syntax_error("Bowl number unspecified.")
-            
-            ## ...explicitly define the bowl number...
-            bowl_number = int(mix.group(2)[:-2]) if mix.group(2) is not None else DEFAULT_BOWL
-            
-            ## ...randomise the ingredients in that bowl...
-            random.shuffle(self.mixing_bowls[bowl_number])
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the mix() method...
+        self.mix(
+            mixingbowl = self._bowl_number(mix[1])
+            )
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_take(self, fridge)->None:
+        """
+        `Take ingredient from refrigerator.`
+        <fridge> holds the groups of TAKE_RE matched against the instruction.
+        """
         
-        ## K. Take from fridge
-        ##  `Take ingredient from refrigerator.`
         ## This reads a numeric value from STDIN into the ingredient named, 
         ##  overwriting any previous value.
-        ## Create the regex.
-        fridge_take_regex = "Take ([a-zA-Z ]+) from refrigerator"
         
-        ## See if the current line fits this regex.
-        fridge = re.search(fridge_take_regex, instruction)
+        ## ...check the ingredient exists...
+        if fridge[0] not in self.ingredients:
+            self.syntax_error(f"Ingredient {fridge[0]} does not exist.")
         
-        ## If the regex search returned something...
-        if fridge != None:
-            
-            ## ...check the ingredient exists...
-            if fridge.group(1) not in self.ingredients:
-                self.syntax_error("Ingredient {fridge.group(1)} does not exist.")
-            
-            ## ...get the user input and store it as the value of the specified ingredient...
-            self.ingredients[fridge.group(1)][0] = int(input(fridge.group(1) + ": "))
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...get the user input and store it as the value of the specified ingredient...
+        self.ingredients[fridge[0]][0] = self._read_value(fridge[0])
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _read_value(self, ingredient)->int:
+        """
+        Read the value of <ingredient> from STDIN.
+        
+        Someone typing at a terminal is prompted with the ingredient name.
+        When STDIN is a file or a pipe there is nobody to prompt,
+         so the next line is read straight from the buffered stream.
+
+        Parameters
+        ----------
+        ingredient : str
+            Name of the ingredient being taken from the refrigerator.
+
+        Returns
+        -------
+        int
+            The value read.
+
+        """
+        
+        if sys.stdin.isatty(): return int(input(f"{ingredient}: "))
+        
+        line = sys.stdin.readline()
+        
+        ## An empty string means there is no input left.
+        if not line: self.runtime_error(f"No input left to take {ingredient} from refrigerator.")
+        
+        return int(line)
+    
+    def _handle_pour(self, pour)->None:
+        """
+        `Pour contents of the [nth] mixing bowl into the [pth] baking dish.`
+        <pour> holds the groups of POUR_RE matched against the instruction.
+        """
         
-        ## L. Pour
-        ##  `Pour contents of the [nth] mixing bowl into the [pth] baking dish.`
         ##  This copies all the ingredients from the nth mixing bowl to the 
         ##   pth baking dish, retaining the order and putting them 
         ##   on top of anything already in the baking dish.
-        ## Create the regex
-        pour_regex = "Pour contents of the (?:the )?(?:([1-9]\d*)(?:st|nd|rd|th) )?mixing bowl"+\
-                        " into the (?:the )?(?:([1-9]\d*)(?:st|nd|rd|th) )?baking dish"
         
-        ## See if the current line fits this regex.
-        pour = re.search(pour_regex, instruction)   
-
-        ## If the regex search returned something...   
-        if pour != None:
-
-            ## ...call the pour() method...
-            self.pour(
-                mixingbowl = pour.group(1),
-                bakingdish = pour.group(2)
-                )           
-            
-            ## ...and return, so the calling method can move to the next instruction.
-            return
+        ## ...call the pour() method...
+        self.pour(
+            mixingbowl = self._bowl_number(pour[0]),
+            bakingdish = self._dish_number(pour[1])
+            )           
         
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_refrigerate(self, fridge)->bool:
+        """
+        `Refrigerate [for number hours].`
+        <fridge> holds the groups of REFRIGERATE_RE matched against the instruction.
+        """
         
-        ## M. Refrigerate
-        ##  `Refrigerate [for number hours].`
         ## This causes execution of the recipe in which it appears to end immediately.
         ## If in an auxiliary recipe, the auxiliary recipe ends and 
         ##  the sous-chef's first mixing bowl is passed back to 
         ##  the calling chef as normal. 
+        
         ## If a number of hours is specified, the recipe will print out 
         ##  its first <number> baking dishes before ending.
+        if fridge[0] != None:
+            self.serve(int(fridge[0]))
         
-        ## Create regex
-        refrigerate_regex = "Refrigerate (?:for ([0-9]+))? hours"
-        
-        ## See if the current line fits this regex.
-        fridge = re.search(refrigerate_regex, instruction)
-        
-        ## If the regex search returned something...   
-        if fridge != None:
-            
-            ## If a number of hours is specified, the recipe will print out 
-            ##  its first <number> baking dishes before ending.
-            if fridge.group(1) != None:
-                self.serve(fridge.group(1))
-            
-            ## End recipe.
-            self.refrigerated = True # So everybody knows it's ended.
-            self.current_instruction_line = len(self.method) # Get out of the main loop
-            return True # Get out of any inner loops
-        
+        ## End recipe.
+        self.refrigerated = True # So everybody knows it's ended.
+        self.current_instruction_line = len(self.method) # Get out of the main loop
+        return True # Get out of any inner loops
+    
+    def _handle_add_dry(self, add_dry)->None:
+        """
+        `Add dry ingredients [to [nth] mixing bowl].`
+        <add_dry> holds the groups of ADD_DRY_RE matched against the instruction.
+        """
         
-        ## N. Add dry ingredients.
-        ##  `Add dry ingredients [to [nth] mixing bowl].`
         ## This adds the values of all the dry ingredients together 
         ##  and places the result into the nth mixing bowl.
-        ## Create regex
-        add_dry_regex = "Add dry ingredients(?: to the (1st|2nd|3rd|[0-9]+th) mixing bowl)?"
         
-        ## See if the current line fits this regex.
-        add_dry = re.search(add_dry_regex, instruction)
+        ## Sum the values of only the dry ingredients...
+        total = sum(v[0] for v in self.ingredients.values() if v[1] == DRY)
         
-        ## If the regex search returned something...   
-        if add_dry != None:
-            
-            ## Subroutines to quickly calculate dry values
-            def isdry(x):
-                return x[1] == "dry"
-            
-            def dryvalues(x):
-                return x[0]
-            
-            ## Get only the dry ingredients
-            dry = filter(isdry, self.ingredients.values())
-            
-            ## Get only their values
-            dry = map(dryvalues, dry)            
-            
-            ## Do a put() into the nth mixing bowl.
-            self.put(ingredient = [sum(dry), "dry"],
-                     mixingbowl = add_dry.group(1))
+        ## ...explicitly define the bowl number...
+        bowl_number = DEFAULT_BOWL if add_dry[0] is None else add_dry[0]
+        
+        ## ...create the mixing bowl if necessary...
+        if bowl_number not in self.mixing_bowls:
+            self.mixing_bowls[bowl_number] = Bowl()
         
+        ## ...place the total, as a dry value, directly on top of the nth mixing bowl.
+        ## There is no named ingredient to look up, so we don't go through put().
+        self.mixing_bowls[bowl_number].push(total, DRY)
+        
+        ## ...and return, so the calling method can move to the next instruction.
+        return
+    
+    def _handle_serve_with(self, auxiliary)->None:
+        """
+        `Serve with auxiliary-recipe.`
+        <auxiliary> holds the groups of SERVE_WITH_RE matched against the instruction.
+        """
         
-        ## O. Call for sous-chef
-        ##  `Serve with auxiliary-recipe.`
         ## This invokes a sous-chef to immediately preepare the named auxiliary-recipe. 
         ## The calling chef waits until the sous-chef is finished before continuing. 
         ## When the auxiliary recipe is finished, the ingredients in its first mixing bowl 
         ##  are placed in the same order into the calling chef's first mixing bowl.
-        ## Create the regex.
-        aux_regex = "Serve with ([a-zA-Z ]+\.)"
-        
-        ## See if this line matches the syntax.
-        auxiliary = re.search(aux_regex, instruction)
-        
-        ## This line is calling for a sous-chef!
-        if auxiliary != None:      
-            
-            ## Call sous-chef.
-            ## The name of the recipe is what the regex found above.
-            self.call_sous_chef(
-                aux_recipe_name = auxiliary.group(1)
-                )                         
-            
-            return
-        
-        
-        ## P1. Stir
-        ##  `Stir [the [nth] mixing bowl] for number minutes.`
-        ## This "rolls" the top number ingredients in the nth mixing bowl, 
-        ##  such that the top ingredient goes down that number of ingredients 
-        ##  and all ingredients above it rise one place. 
-        ## If there are not that many ingredients in the bowl, 
-        ##  the top ingredient goes to tbe bottom of the bowl 
-        ##  and all the others rise one place.
         
-        ## Create regex
-        stir_regex = "Stir(?: the (1st|2nd|3rd|[0-9]+th) mixing bowl)? for ([1-9]+) minutes?"
-        
-        ## See if this line matches.
-        stir = re.search(stir_regex, instruction)
-        
-        ## If it matches...
-        if stir != None:
-            
-            ## ...stir the bowl the specified amount.
-            self.stir(
-                mixingbowl  = stir.group(1),
-                minutes     = stir.group(2),
-                ingredient  = None
-                )
-            
-            return
+        ## Call sous-chef.
+        ## The name of the recipe is what the regex found above.
+        self.call_sous_chef(
+            aux_recipe_name = auxiliary[0]
+            )                         
         
+        return
+    
+    def _handle_stir(self, stir)->None:
+        """
+        `Stir [the [nth] mixing bowl] for number minutes.`
+        or
+        `Stir ingredient into the [nth] mixing bowl.`
+        <stir> holds the groups of STIR_RE matched against the instruction.
+        Groups 1 and 2 are filled for the first form, groups 3 and 4 for the second.
+        """
         
-        ## P2. Stir into
-        ##  `Stir ingredient into the [nth] mixing bowl.`
+        ## `Stir ingredient into the [nth] mixing bowl.`
         ## This rolls the number of ingredients in the nth mixing bowl 
         ##  equal to the value of ingredient, such that the top ingredient 
         ##  goes down that number of ingredients and all ingredients above it rise one place. 
         ## If there are not that many ingredients in the bowl, 
         ##  the top ingredient goes to the bottom of the bowl 
         ##  and all the others rise one place.
-        
-        ## Create regex.
-        stir2_regex = "Stir ([a-zA-Z0-9 ]+) into the (1st|2nd|3rd|[0-9]+th) mixing bowl"
-        
-        ## See if this line matches.
-        stir = re.search(stir2_regex, instruction)
-        
-        ## If it matches...
-        if stir != None:
+        if stir[2] is not None:
             
             ## ...stir the bowl the specified amount.
             self.stir(
-                mixingbowl  = stir.group(2),
+                mixingbowl  = DEFAULT_BOWL if stir[3] is None else stir[3],
                 minutes     = 0,
-                ingredient  = stir.group(1)
+                ingredient  = stir[2]
                 )
             
             return
         
+        ## `Stir [the [nth] mixing bowl] for number minutes.`
+        ## This "rolls" the top number ingredients in the nth mixing bowl, 
+        ##  such that the top ingredient goes down that number of ingredients 
+        ##  and all ingredients above it rise one place. 
+        ## If there are not that many ingredients in the bowl, 
+        ##  the top ingredient goes to tbe bottom of the bowl 
+        ##  and all the others rise one place.
+        
+        ## ...stir the bowl the specified amount.
+        self.stir(
+            mixingbowl  = self._bowl_number(stir[0]),
+            minutes     = stir[1],
+            ingredient  = None
+            )
+        
+        return
+    
+    def _handle_loop(self, verb_search)->bool:
+        """
+        `Verb the ingredient.`
+        <verb_search> holds the groups of VERB_RE matched against the instruction.
+        """
         
-        ## Q. No standard keyword: look for a verb to begin a loop.
-        ##  `Verb the ingredient.`
         ## This marks the beginning of a loop. 
         ## It must appear as a matched pair with the following statement. 
         ## The loop executes as follows: The value of `ingredient` is checked. 
@@ -756,97 +1168,119 @@ class Chef:
         ##  and execution continues at the statement after the "until". 
         ## Loops may be nested.
         
-        ## Create regex.
-        verb_regex_start = "([a-zA-Z]+) the ([a-zA-Z ]+)\."
-        # verb_regex = "([a-zA-Z]+) the ([a-zA-Z ]+) ?(?!until)"
+        ## It matches, so we're at the beginning of a loop.
+        ## Find the end of the loop, and pass all the instructions
+        ##  within the loop to self.cook_loop().
+        index_loop_start = self.current_instruction_line
         
-        ## See if this line matches.
-        verb_search = re.search(verb_regex_start, instruction)
+        ## The loop starting on this line is always the same, so we only
+        ##  search for its end the first time we get here.
+        ## That matters for nested loops, whose first line is reached
+        ##  on every pass through the outer loop.
+        if index_loop_start in self._loops:
+            method_lines, ingredient_name_end = self._loops[index_loop_start]
+            return self.cook_loop(
+                        method_lines            = method_lines, 
+                        ingredient_name_start   = verb_search[1],
+                        ingredient_name_end     = ingredient_name_end
+                        )
         
-        if verb_search != None:   
-             
-            ## It matches, so we're at the beginning of a loop.
-            ## Find the end of the loop, and pass all the instructions
-            ##  within the loop to self.cook_loop().
-            index_loop_start = self.current_instruction_line
-            
-            ## Define the regex that will match the end of this loop.
-            ## First, get the past tense of the current verb.
-            verb_present = verb_past = verb_search.group(1)
-            
-            ## Verbs that end in e need to drop it before adding "ed"
-            if verb_past[-1] == "e": verb_past = verb_past[:-1]
-            
-            ## Verbs that end in y need to swap it for an i before adding "ed"
-            if verb_past[-1] == "y": verb_past = verb_past[:-1] + "i"
-            
-            ## Now add "ed" to get the past tense.
-            verb_past += "ed"
-            
-            ## Convert to lower case 
-            verb_past = verb_past.lower()
-            
-            ## Create the regex.
-            ##  `Verb [the ingredient] until verbed.`
-            ## This marks the end of a loop. 
-            ## It must appear as a matched pair with the above statement. 
-            ## `verbed` must match the `Verb` in the matching loop start statement. 
-            ## The Verb in this statement may be arbitrary and is ignored. 
-            ## If the ingredient appears in this statement, 
-            ##  its value is decremented by 1 when this statement executes. 
-            ## The ingredient does not have to match the ingredient in the 
-            ##  matching loop start statement.
-            ## Create the regex.
-            verb_regex_end = f"([a-zA-Z]+) (the ([a-zA-Z ]+))? until {verb_past}\."
+        ## Define the regex that will match the end of this loop.
+        ## First, get the past tense of the current verb.
+        verb_present = verb_past = verb_search[0]
+        
+        ## Verbs that end in e need to drop it before adding "ed"
+        if verb_past[-1] == "e": verb_past = verb_past[:-1]
+        
+        ## Verbs that end in y need to swap it for an i before adding "ed"
+        if verb_past[-1] == "y": verb_past = verb_past[:-1] + "i"
+        
+        ## Now add "ed" to get the past tense.
+        verb_past += "ed"
+        
+        ## Convert to lower case 
+        verb_past = verb_past.lower()
+        
+        ## Create the regex.
+        ##  `Verb [the ingredient] until verbed.`
+        ## This marks the end of a loop. 
+        ## It must appear as a matched pair with the above statement. 
+        ## `verbed` must match the `Verb` in the matching loop start statement. 
+        ## The Verb in this statement may be arbitrary and is ignored. 
+        ## If the ingredient appears in this statement, 
+        ##  its value is decremented by 1 when this statement executes. 
+        ## The ingredient does not have to match the ingredient in the 
+        ##  matching loop start statement.
+        ## Create the regex.
+        ## This is compiled once per verb and reused; see _loop_end_regex().
+        verb_regex_end = _loop_end_regex(verb_past)
+        
+        ## Step through each future line, checking whether it ends this loop.
+        
+        ## Initialise variables for loop
+        ## Use indices to list method lines
+        index_loop_end = index_loop_start
+        
+        ## Use a dict with line numbers as keys
+        ## Don't include the first line or you get an infinite loop!
+        ## Once found, the lines are kept in self._loops; see below.
+        method_lines = {}
+        
+        while index_loop_end + 1 < len(self.method):
             
-            ## Step through each future line, checking whether it ends this loop.
+            ## Increment the index.
+            index_loop_end += 1
             
-            ## Initialise variables for loop
-            ## Use indices to list method lines
-            index_loop_end = index_loop_start
+            method_lines[index_loop_end] = self.method[index_loop_end]
             
-            ## Use a dict with line numbers as keys
-            ## Don't include the first line or you get an infinite loop!
-            # method_lines = {index_loop_start:instruction}
-            method_lines = {} # debug, make it class property
+            ## Check whether the loop-ending regex matches this line.
+            verb_end_match = verb_regex_end.search(self.method[index_loop_end])
             
-            while index_loop_end < len(self.method):
-                
-                ## Increment the index.
-                index_loop_end += 1
+            ## Does this method line end the current loop?
+            if verb_end_match != None:
                 
-                method_lines[index_loop_end] = self.method[index_loop_end]
+                ## Yes: call cook-loop
+                ingredient_name_start = verb_search[1]
+                ingredient_name_end   = verb_end_match.group(3)
                 
-                # print(method_lines) # debug
+                ## Remember this loop for next time.
+                self._loops[index_loop_start] = (method_lines, ingredient_name_end)
                 
-                ## Check whether the loop-ending regex matches this line.
-                verb_end_match = re.search(verb_regex_end,
-                                          self.method[index_loop_end]
-                                          )
-                
-                ## Does this method line end the current loop?
-                if verb_end_match != None:
-                    
-                    ## Yes: call cook-loop
-                    ingredient_name_start = verb_search.group(2)
-                    ingredient_name_end   = verb_end_match.group(3)
-                    
-                    return self.cook_loop(
-                                method_lines            = method_lines, 
-                                ingredient_name_start   = ingredient_name_start,
-                                ingredient_name_end     = ingredient_name_end
-                                )
-            
-            ## Error: couldn't find end of loop.
-            self.syntax_error(f'Verb unmatched. Could not find "{verb_past}".')
-            
-            return
-        
-        
-        ## If the method reaches this point,
-        ##  no recognisable instruction was found.
-        ## That's a syntax error.
-        self.syntax_error(f"Instruction not recognised: {instruction}")
+                return self.cook_loop(
+                            method_lines            = method_lines, 
+                            ingredient_name_start   = ingredient_name_start,
+                            ingredient_name_end     = ingredient_name_end
+                            )
+        
+        ## Error: couldn't find end of loop.
+        self.syntax_error(f'Verb unmatched. Could not find "{verb_past}".')
+    
+    
+    ## The instructions in the method, grouped by the word they begin with.
+    ## Where several instructions begin with the same word,
+    ##  they are tried in the order listed.
+    ## Each entry also lists which of the regex's groups hold a bowl or dish ordinal.
+    _KEYWORD_HANDLERS = {
+        "Put"         : ((PUT_RE, _handle_put, (1,)),),
+        "Fold"        : ((FOLD_RE, _handle_fold, (1,)),),
+        ## `Add dry ingredients` must be tried before `Add ingredient`,
+        ##  which would otherwise treat "dry ingredients" as the ingredient.
+        "Add"         : ((ADD_DRY_RE, _handle_add_dry, (0,)), (ADD_RE, _handle_add, (1,))),
+        "Remove"      : ((REMOVE_RE, _handle_remove, (1,)),),
+        "Combine"     : ((COMBINE_RE, _handle_combine, (1,)),),
+        "Divide"      : ((DIVIDE_RE, _handle_divide, (1,)),),
+        ## Likewise `Liquefy contents of the mixing bowl` before `Liquefy ingredient`.
+        "Liquefy"     : ((LIQUEFY_BOWL_RE, _handle_liquefy_bowl, (0,)), (LIQUEFY_INGREDIENT_RE, _handle_liquefy_ingredient, ())),
+        "Clean"       : ((CLEAN_RE, _handle_clean, (0,)),),
+        "Mix"         : ((MIX_RE, _handle_mix, (1,)),),
+        "Take"        : ((TAKE_RE, _handle_take, ()),),
+        "Pour"        : ((POUR_RE, _handle_pour, (0, 1)),),
+        ## `Refrigerate.` on its own is a single word.
+        "Refrigerate" : ((REFRIGERATE_RE, _handle_refrigerate, ()),),
+        "Refrigerate.": ((REFRIGERATE_RE, _handle_refrigerate, ()),),
+        "Serve"       : ((SERVE_WITH_RE, _handle_serve_with, ()),),
+        "Stir"        : ((STIR_RE, _handle_stir, (0, 3)),),
+        }
     
     
     def call_sous_chef(self,aux_recipe_name)->None:
@@ -866,8 +1300,11 @@ class Chef:
         ## Get the script of the auxiliary recipe
         ##  from a class property that stores info about
         ##  all auxiliary recipes.
+        ## Recipe names are matched regardless of case,
+        ##  e.g. `Serve with chocolate sauce.` calls the recipe `Chocolate Sauce.`
         ## First check it exists.
-        if aux_recipe_name not in self.auxiliary_recipes:
+        aux_recipe = self.auxiliary_recipes.get(aux_recipe_name.lower())
+        if aux_recipe is None:
             
             ## The main script called for an auxiliary recipe,
             ##  but the auxiliary recipe doesn't exist.
@@ -879,18 +1316,37 @@ class Chef:
             ##  in the error message.
             if len(self.auxiliary_recipes) > 0:
                 
-                error_message += f" Available recipes: {', '.join(self.auxiliary_recipes.keys())}"
+                error_message += f" Available recipes: {', '.join(recipe['name'] for recipe in self.auxiliary_recipes.values())}"
             
             self.runtime_error(error_message)
         
         ## Get the auxiliary script.
-        aux_recipe_script = self.auxiliary_recipes[aux_recipe_name]["script"]
+        aux_recipe_script = aux_recipe["script"]
         
         ## Call the sous-chef to cook the auxiliary recipe.
+        ## The sous-chef gets its own copy of every bowl and dish,
+        ##  so nothing it does to them changes ours.
         sous_chef = Chef(script = aux_recipe_script, 
-                         mixing_bowls  = copy.copy(self.mixing_bowls),
-                         baking_dishes = copy.copy(self.baking_dishes)
+                         mixing_bowls  = {key: bowl.copy() for key, bowl in self.mixing_bowls.items()},
+                         baking_dishes = {key: dish.copy() for key, dish in self.baking_dishes.items()}
                          )
+        
+        ## If a sous-chef has cooked this recipe before, the new one
+        ##  takes over everything that sous-chef worked out from the recipe text,
+        ##  e.g. the method and where its loops end, instead of parsing it again.
+        ## Otherwise this sous-chef is the one later sous-chefs will copy.
+        first_sous_chef = self._sous_chefs.get(aux_recipe["name"])
+        if first_sous_chef is None:
+            self._sous_chefs[aux_recipe["name"]] = sous_chef
+        else:
+            for slot in Chef._RECIPE_SLOTS:
+                setattr(sous_chef, slot, getattr(first_sous_chef, slot))
+        
+        ## The sous-chef's script only holds the auxiliary recipe itself,
+        ##  so hand over our list of auxiliary recipes.
+        ## That way the sous-chef can call on them too, without looking for them again.
+        sous_chef._auxiliary_recipes = self.auxiliary_recipes
+        
         sous_chef.cook()
         
         ## Now take the contents of the sous-chef's first mixing bowl
@@ -903,19 +1359,24 @@ class Chef:
         This puts the ingredient into the nth mixing bowl.
         """
         
-        ## Use the default bowl if none was supplied
-        if not mixingbowl: mixingbowl = DEFAULT_BOWL
-        
-        ## Check the ingredient exists
-        if ingredient not in self.ingredients: 
+        ## Check the ingredient exists.
+        ## A single get() both checks and fetches it.
+        record = self.ingredients.get(ingredient)
+        if record is None: 
             self.syntax_error(f"Ingredient not found: {ingredient}")
         
-        ## Check the mixing bowl exists
-        if mixingbowl not in self.mixing_bowls: 
-            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
+        ## Chef has an unlimited supply of mixing bowls.
+        ## Create the mixing bowl if necessary.
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            bowl = self.mixing_bowls[mixingbowl] = Bowl()
         
-        ## Add ingredient to top of mixingbowl
-        self.mixing_bowls[mixingbowl].append(copy.copy(self.ingredients[ingredient]))
+        ## Add the ingredient's value and state to top of mixingbowl.
+        ## The bowl holds values rather than the ingredient itself,
+        ##  so later changes to the ingredient do not affect the bowl.
+        ## The ingredient's type is already a DRY/LIQUID state flag.
+        value, ingredient_type, _ = record
+        bowl.push(value, ingredient_type)
         
         
     def fold(self, 
@@ -940,17 +1401,52 @@ class Chef:
 
         """
         
-        ## Determine which mixing bowl to use.
-        key = DEFAULT_BOWL
-        if mixingbowl: key = mixingbowl
+        ## Check the ingredient exists
+        record = self.ingredients.get(ingredient)
+        if record is None: 
+            self.syntax_error(f"Ingredient not found: {ingredient}")
+        
+        ## Check the mixing bowl exists
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
+        
+        ## Get the top value out of the bowl
+        value, _ = bowl.pop()
         
-        ## Get the ingredient out of the bowl
-        full_ingredient = self.mixing_bowls[key].pop()
+        ## Put the removed value onto the named ingredient.
+        record[0] = value
+        
+        
+    def _ingredient_value(self, ingredient, default):
+        """
+        Look up the value of <ingredient> for one of the arithmetic verbs.
+
+        Parameters
+        ----------
+        ingredient : str
+            Name of the ingredient.
+        default : int
+            Value to use if the ingredient has no value yet,
+             i.e. the identity of the arithmetic operation:
+             0 to add or remove, 1 to combine or divide.
+
+        Returns
+        -------
+        int or float
+            The value of the ingredient.
+
+        """
         
-        ## Put the removed ingredient's value onto the named ingredient.
-        self.ingredients[ingredient][0] = full_ingredient[0]
+        ## A single get() both checks the ingredient exists and fetches it.
+        record = self.ingredients.get(ingredient)
+        if record is None: 
+            self.syntax_error(f"Ingredient not found: {ingredient}")
         
+        value = record[0]
         
+        return default if value is None else value
+    
     def addingredient(self, 
                       ingredient, 
                       mixingbowl
@@ -960,26 +1456,20 @@ class Chef:
              on top of the mixing bowl and store the result in the mixing bowl.
         """
         
-        ## If no mixing bowl was supplied, use the default
-        if not mixingbowl: mixingbowl = DEFAULT_BOWL
-        
-        ## Check the ingredient exists
-        if ingredient not in self.ingredients: 
-            self.syntax_error(f"Ingredient not found: {ingredient}")
+        ## Get the value of the ingredient.
+        ## An ingredient with no value adds nothing.
+        value = self._ingredient_value(ingredient, 0)
         
         ## Check the mixing bowl exists
-        if mixingbowl not in self.mixing_bowls: 
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
             self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
         
-        ## Get the value of the ingredient
-        value = self.ingredients[ingredient][0]
-        
         ## It's mixing bowl number <mixingbowl>
-        ## It's the top ingredient, which is index -1
-        ## It's the value of that ingredient, which is index 0
-        ## Altogether, that's self.mixing_bowls[mixingbowl][-1][0].
+        ## It's the top value, which is index -1 of the bowl's values
+        ## Altogether, that's self.mixing_bowls[mixingbowl].values[-1].
         ## We add the specified ingredient's value to that.
-        self.mixing_bowls[mixingbowl][-1][0] += value
+        bowl.values[-1] += value
         
     def removeingredient(self, ingredient, mixingbowl)->None:
         """
@@ -999,16 +1489,16 @@ class Chef:
 
         """
         
-        value = self.ingredients[ingredient][0]
+        ## Get the value of the ingredient.
+        ## An ingredient with no value takes nothing away.
+        value = self._ingredient_value(ingredient, 0)
         
-        key = DEFAULT_BOWL
-        if mixingbowl:
-            key = mixingbowl
-            
-        if value == None:
-            value = 0
+        ## Check the mixing bowl exists
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
         
-        self.mixing_bowls[key][-1][0] -= value
+        bowl.values[-1] -= value
         
     def combineingredient(self, ingredient, mixingbowl):
         """
@@ -1016,18 +1506,16 @@ class Chef:
              on top of the mixing bowl and store the result in the mixing bowl.
         """
         
+        ## Get the value of the ingredient.
+        ## An ingredient with no value leaves the mixing bowl unchanged.
+        value = self._ingredient_value(ingredient, 1)
         
+        ## Check the mixing bowl exists
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
         
-        value = self.ingredients[ingredient][0]
-        
-        key = DEFAULT_BOWL
-        if mixingbowl:
-            key = mixingbowl
-            
-        if value == None:
-            value = 0
-        
-        self.mixing_bowls[key][-1][0] *= value
+        bowl.values[-1] *= value
         
     def divideingredient(self, 
                          ingredient, 
@@ -1041,36 +1529,38 @@ class Chef:
         ----------
         ingredient : str
             Name of the ingredient whose value is the divisor.
-        mixingbowl : str
-            Ordinal numeral e.g. 1st, 2nd, 3rd etc
-             indicating the mixing bowl whose top value
+        mixingbowl : int
+            Index of the mixing bowl whose top value
              is to be divided by the value of <ingredient>.
-            To get just the number (as str), use <mixingbowl[:-2]>.
 
         """
         
         ## Get the divisor: the value of <ingredient>.
-        value = self.ingredients[ingredient][0]
-        
-        ## Get the mixing bowl number.
-        key = DEFAULT_BOWL
-        if mixingbowl:
-            key = mixingbowl ## Get the integer (as string) from the ordinal numeral.
-        
         ## Ingredients with no value are assumed to leave the mixing bowl unchanged.
-        if value == None:
-            value = 1
+        value = self._ingredient_value(ingredient, 1)
+        
+        ## Check the mixing bowl exists
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
         
         ## Divide the top value of the mixing bowl by the ingredient value.
-        ##  <key> is the bowl
-        ##  <-1> indicates the top ingredient, which is a list with entries [value, wet/dry, name]
-        ##  <0> is the first entry in that list, i.e. the ingredient's value.
-        self.mixing_bowls[key][-1][0] = float(self.mixing_bowls[key][-1][0]/value)
+        ##  <mixingbowl> is the bowl
+        ##  <values> holds the values of the ingredients in the bowl
+        ##  <-1> indicates the top value.
+        ## If both are integers and the division is exact, the result stays an integer.
+        ## Otherwise it is a float, as recipes such as cherrypi rely on.
+        values = bowl.values
+        top = values[-1]
+        if isinstance(top, int) and isinstance(value, int) and top % value == 0:
+            values[-1] = top // value
+        else:
+            values[-1] = top / value
     
     
     def pour(self,
-             mixingbowl = None,
-             bakingdish = None
+             mixingbowl = DEFAULT_BOWL,
+             bakingdish = DEFAULT_DISH
              )->None:
         """
         This copies all the ingredients from the nth mixing bowl 
@@ -1079,10 +1569,10 @@ class Chef:
 
         Parameters
         ----------
-        mixingbowl : TYPE, optional
-            DESCRIPTION. The default is None.
-        bakingdish : TYPE, optional
-            DESCRIPTION. The default is None.
+        mixingbowl : int, optional
+            Index of the mixing bowl to copy from. The default is DEFAULT_BOWL.
+        bakingdish : int, optional
+            Index of the baking dish to copy into. The default is DEFAULT_DISH.
 
         Returns
         -------
@@ -1091,18 +1581,47 @@ class Chef:
 
         """
         
-        ## Revert to default mixing bowl if necessary
-        mixingbowl = int(mixingbowl[:-2]) if mixingbowl else DEFAULT_BOWL
-        
-        ## Revert to default baking dish if necessary
-        bakingdish = int(bakingdish[:-2]) if bakingdish else DEFAULT_DISH
+        ## Check the mixing bowl exists
+        bowl = self.mixing_bowls.get(mixingbowl)
+        if bowl is None: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
         
         ## Create the baking dish if necessary
-        if not bakingdish in self.baking_dishes:                    
-            self.baking_dishes[bakingdish] = []
+        dish = self.baking_dishes.get(bakingdish)
+        if dish is None:                    
+            dish = self.baking_dishes[bakingdish] = Bowl()
+        
+        ## Copy contents of mixing bowl into baking dish.
+        ## extend() copies each whole sequence in one go,
+        ##  and the lists over-allocate as they grow, so repeated pours stay cheap.
+        dish.extend(bowl) 
+        
+    
+    def mix(self,
+            mixingbowl = DEFAULT_BOWL
+            )->None:
+        """
+        This randomises the order of the ingredients in the nth mixing bowl.
+
+        Parameters
+        ----------
+        mixingbowl : int
+            Index of the mixing bowl to be shuffled.
+
+        """
         
-        ## Copy contents of mixing bowl into baking dish
-        self.baking_dishes[bakingdish].extend(self.mixing_bowls[mixingbowl]) 
+        ## Check the mixing bowl exists
+        if mixingbowl not in self.mixing_bowls: 
+            self.runtime_error(f"Mixing bowl {mixingbowl} does not exist.")
+        
+        ## Randomise the ingredients in that bowl.
+        ## Shuffle the positions, then reorder the values and states together
+        ##  so that each value keeps its dry/liquid state.
+        bowl = self.mixing_bowls[mixingbowl]
+        order = list(range(len(bowl)))
+        self._rng.shuffle(order)
+        bowl.values[:] = [bowl.values[i] for i in order]
+        bowl.states[:] = bytes(bowl.states[i] for i in order)
         
     
     def stir(self,
@@ -1127,17 +1646,8 @@ class Chef:
         if ingredient:
             value = int(self.ingredients[ingredient][0])
         
-        ## Default to the zeroth mixing bowl
-        key = DEFAULT_BOWL
-        if mixingbowl:
-            
-            ## The string like '3rd' was supplied.
-            ## Get the integer by chopping off the last two characters.
-            key = int(mixingbowl[:-2])
-            
-        else:
-            ## If no mixing bowl was named, there must only be one mixing bowl in the recipe.
-            assert len(self.mixing_bowls) == 1
+        ## The mixing bowl number was resolved to an integer by _decode_instruction().
+        key = mixingbowl
         
         if key not in self.mixing_bowls:
             self.syntax_error(f"Mixing bowl {str(key)} not found.")
@@ -1157,12 +1667,54 @@ class Chef:
         ## Represented by the list
         ##      [4, 1, 3, 2]
         
-        ## Remove the top ingredient
-        ing = self.mixing_bowls[key].pop() # e.g. [4, 3, 2]
+        ## Remove the top ingredient, e.g. [4, 3, 2],
+        ##  and insert it at place <value> from the *end*, e.g. [4, 1, 3, 2].
+        self.mixing_bowls[key].roll(value)
+            
+    
+    def _scan_structure(self)->None:
+        """
+        Find the structural markers of the recipe in a single pass over the script,
+         rather than searching the whole script separately for each of them.
+        
+        Sets self._ingredients_start and self._method_start, the offsets of the
+         'Ingredients.' and 'Method.' declarations (-1 if there isn't one),
+         self._serves_count, self._has_multiple_bowls and self._has_multiple_dishes.
+        """
+        
+        self._ingredients_start = -1
+        self._method_start = -1
+        self._serves_count = 0
+        self._has_multiple_bowls = False
+        self._has_multiple_dishes = False
+        found_serves = False
         
-        ## Insert the top ingredient at place <value>
-        ## Location is <value> from the *end*, so multiply <value> by -1.
-        self.mixing_bowls[key].insert(-1*value,ing)
+        for marker in STRUCTURE_RE.finditer(self.script):
+            
+            ## Only the first ingredient list and method belong to this recipe.
+            ## Any others belong to auxiliary recipes.
+            if marker.lastgroup == "ingredients":
+                if self._ingredients_start == -1: self._ingredients_start = marker.start()
+            
+            elif marker.lastgroup == "method":
+                if self._method_start == -1: self._method_start = marker.start()
+            
+            ## Likewise only the first Serves statement.
+            elif marker.lastgroup == "serves":
+                if not found_serves: self._serves_count = int(marker.group("servings"))
+                found_serves = True
+            
+            ## A bowl or dish with index 2 or higher has been referenced,
+            ##  so this recipe has multiple of them.
+            elif marker.lastgroup == "bowls":
+                self._has_multiple_bowls = True
+            else:
+                self._has_multiple_dishes = True
+            
+            ## Bowls and dishes can be referenced anywhere, including auxiliary recipes,
+            ##  so we can only stop early once we've seen everything there is to find.
+            if found_serves and self._has_multiple_bowls and self._has_multiple_dishes:
+                break
             
     
 
@@ -1170,8 +1722,9 @@ class Chef:
     """
         Aliases: Lazy instantiation of class properties.
         Define a bunch of public property names that are actually wrappers to class methods.
-        The class method figures out whether the corresponding private property exists yet.
-        If the property already exists, the method returns it.
+        The class method figures out whether the corresponding private property has been set yet.
+        Until then it holds the _UNSET sentinel (None is a valid value for some of them).
+        If the property has already been set, the method returns it.
         If it doesn't, the method creates the property and returns it.
     """
     @property
@@ -1189,28 +1742,23 @@ class Chef:
 
         """
         
-        if hasattr(self,"_recipename"): return self._recipename
+        if self._recipename is not _UNSET: return self._recipename
             
         ## We have not yet determined the recipe name. Do it now.
         
-        ## Use regular expression to find the recipe name within the self.script string.
-        ## re.match() tries to find just the first instance of a pattern.
-        match_recipename = re.match(
-            ## (.*): Create a group, (), that matches any text or whitespace, ., except \n multiple times, *
-            ## \.: match the full stop character . exactly
-            ## \n\n: match two newline characters exactly
-            "(.*\.)\n\n",
-            self.script)
-        
-        ## We expect exactly one result.
-        if match_recipename == None or len(match_recipename.groups()) > 1:
-            logger.error("Invalid recipe name")
-            sys.exit(-1)
-        
-        ## group(1) will return the 1st capture (stuff within the brackets).
-        ## group(0) will returned the entire matched text i.e. with the \n\n included.
-        ## We don't want the newlines included, so we just get group(1).
-        self._recipename = match_recipename.group(1)
+        ## The recipe title is always the first line of a Chef recipe,
+        ##  is followed by a full stop and then a blank line.
+        ## That is a fixed boundary, so we can find it without a regex.
+        ## We only copy out the title itself, not the rest of the script.
+        title_end = self.script.find("\n\n")
+        title = self.script[:title_end]
+        
+        ## We expect a single line ending in a full stop, followed by a blank line.
+        if title_end == -1 or "\n" in title or not title.endswith("."):
+            raise ChefParseError("Invalid recipe name")
+        
+        ## Keep the full stop, as auxiliary recipes are called by "<name>."
+        self._recipename = title
         
         return self._recipename
     
@@ -1228,31 +1776,28 @@ class Chef:
         """
         
         ## Have we already determined the comment?
-        if hasattr(self,'_comment'): return self._comment
+        if self._comment is not _UNSET: return self._comment
         
         ## We have not yet figured out what the comment is, or if it even exists.
         
-        ## First, get a copy of the script with the recipe name, 
-        ##  first full stop and newlines removed.
-        script_without_recipename = self.script.replace(self.recipename+"\n\n", "")
-        # script_without_recipename = re.sub(self.recipename+"\n\n", "", self.script)
-        
-        ## Now get the first thing that matches a paragraph.
-        match_comment = re.match(
-            ## Match everything except newlines, followed by two newlines and the word "Ingredients."
-            "(.*)\n\nIngredients\.", 
-            script_without_recipename,
-            )
+        ## Items in a recipe are separated by a blank line.
+        ## The comment is whatever lies between the recipe title and the ingredient list,
+        ##  whose position is found along with the other structural markers.
+        ## As with the title, we only copy out the comment itself.
+        if self._ingredients_start is _UNSET: self._scan_structure()
+        comment_start = len(self.recipename) + 2
+        comment_end = self._ingredients_start - 2
         
         ## Is there a comment?
-        if match_comment is None:
+        ## If so, it is a single paragraph between the title and the ingredient list.
+        if comment_end <= comment_start or "\n\n" in self.script[comment_start:comment_end]:
             ## There is no comment.
             ## Set self._comment to None and return it.
             self._comment = None
             return self._comment
         
         ## There is a comment.
-        self._comment = match_comment.group(1)
+        self._comment = self.script[comment_start:comment_end]
         
         return self._comment
     
@@ -1268,29 +1813,32 @@ class Chef:
 
         """
         
-        if hasattr(self,"_ingredients_text"): return self._ingredients_text
-        
-        ## Create the regex.
-        ingredients_text_regex = "(Ingredients..*?)Method.\n"
+        if self._ingredients_text is not _UNSET: return self._ingredients_text
         
         ## Find the ingredients in the script.
-        ingredients_search = re.search(ingredients_text_regex, self.script, re.DOTALL)
-        
-        ## If this doesn't exist, it's a syntax error.
-        if not ingredients_search: self.syntax_error("Ingredients list not found.")
-        
-        ## Define the ingredients text to provisionally be what was found between 
-        ##  'Ingredients.' and 'Method.'
-        self._ingredients_text = ingredients_search.group(1)
-        
-        ## Remove cooking time statement if it exists.
-        self._ingredients_text = re.sub("\nCooking time:(.*)", "", self._ingredients_text, re.DOTALL)
-        
-        ## Remove Pre-heat oven statement if it exists.
-        self._ingredients_text = re.sub("\nPre-heat oven(.*)", "", self._ingredients_text, re.DOTALL)
+        ## Its position is found along with the other structural markers.
+        if self._ingredients_start is _UNSET: self._scan_structure()
+        ingredients_start = self._ingredients_start
+        
+        ## The ingredient list must directly follow the recipe title and optional comment,
+        ##  each of which is followed by a blank line,
+        ##  and it runs up to the method.
+        ## If it is anywhere else, or missing, it's a syntax error.
+        expected_start = len(self.recipename) + 2
+        if self.comment is not None: expected_start += len(self.comment) + 2
+        if ingredients_start != expected_start or self._method_start < ingredients_start:
+            self.syntax_error("Ingredients list not found.")
+        
+        ## The ingredient list ends at the first blank line after 'Ingredients.'
+        ## Anything between there and 'Method.' is the optional cooking time
+        ##  and oven temperature statements, each in its own paragraph.
+        ## Their position is known, so we cut them off with a slice
+        ##  instead of searching the whole text for each of them.
+        ingredients_end = self.script.find("\n\n", ingredients_start, self._method_start)
+        if ingredients_end == -1: ingredients_end = self._method_start
         
         ## Strip any remaining whitespace on the right, except for a final newline
-        self._ingredients_text = self._ingredients_text.rstrip() + "\n"
+        self._ingredients_text = self.script[ingredients_start:ingredients_end].rstrip() + "\n"
         
         ## Return the private class attribute
         return self._ingredients_text
@@ -1308,65 +1856,19 @@ class Chef:
             Key is the name of the thing e.g. beans, water, sugar
             Value is a 3-element list [Quantity, Type, Name]
                 Quantity is an integer
-                Type is a string: dry or liquid
+                Type is an integer: DRY or LIQUID
                 Name is a string: same as the key (it's useful to have it in the list too)
             
         """
         
-        if hasattr(self,"_ingredients"): return self._ingredients
-        
-        ## Get raw text
-        ingredients_text = self.ingredients_text
-            
-        ## Replace the 'Ingredients.' declaration.
-        ingredients_text = ingredients_text.replace("Ingredients.\n","")
-        
-        ## Match all of the individual ingredients.
-        ingredients_match = re.findall(
-            ## (([0-9]*): There may or may not be an integer
-            ##  ?: There may or may not be a single whitespace
-            ## (k?g|pinch(?:es)?|m?l|dash(?:es)?|cups?|teaspoons?|tablespoons?)?: 
-                ## There may or may not be a unit of measure
-            ##  ?: There may or may not be a(nother) single whitespace
-            ## ([a-zA-Z0-9 ]+): There needs to be an ingredinent name, which can contain whitespaces and numbers
-            "(([0-9]*) ?((k?g|pinch(?:es)?|m?l|dash(?:es)?|cups?|teaspoons?|tablespoons?) )? ?([a-zA-Z0-9 ]+)\n)", 
-            ingredients_text)
+        if self._ingredients is not _UNSET: return self._ingredients
         
+        ## Parse the raw text. This is cached across Chefs, so a sous-chef
+        ##  cooking the same auxiliary recipe again does not re-parse it.
+        ## Each ingredient gets a fresh list, as its quantity changes during cooking.
         self._ingredients = {}
-        
-        ## Now step through each match, delete it from the recipe and add it to the dictionary
-        for ingredient in ingredients_match:
-            
-            ## Check the thing matched really is in the string
-            ## (I don't know how it couldn't be, but I'm leaving this check here just in case.)
-            if re.match(ingredient[0], ingredients_text) is not None:
-                
-                ## Delete this ingredient from the recipe string
-                ingredients_text = ingredients_text.replace(ingredient[0], "")
-            
-            ## Dry or liquid? Check the unit of measure.
-            ##  Note that chr() is not run on values until output.
-            ##   This is to allow arithmetic operations on liquids.
-            ## There is a pre-defined set of liquid types.
-            if ingredient[3] in ["dash", "cup", "l", "ml", "dashes", "cups"]:
-                
-                ## The quantity is an integer
-                quantity = int(ingredient[1])
-                ingredient_type = "liquid"
-                
-            else:
-                ## It's a dry ingredient, and it might have a quantity
-                ingredient_type = "dry"
-                
-                try:
-                    quantity = int(ingredient[1])
-                except ValueError:
-                    ## There's no number there, so the quantity is None.
-                    ## This means the user will be prompted to input the quantity at runtime.
-                    quantity = None
-            
-            ## Add the dictionary entry.
-            self._ingredients[ingredient[4]] = [quantity, ingredient_type, ingredient[4]]
+        for quantity, ingredient_type, name in _parse_ingredients(self.ingredients_text):
+            self._ingredients[name] = [quantity, ingredient_type, name]
         
         return self._ingredients
     
@@ -1383,21 +1885,21 @@ class Chef:
         """
         
         ## Lazy instantiation
-        if hasattr(self,"_method_text"): return self._method_text
+        if self._method_text is not _UNSET: return self._method_text
         
-        ## Regex to find just the method text.
-        method_text_regex = "Method\.(.*?)\n\n"
-        
-        ## Find the method text.
-        method_text_search = re.search(method_text_regex,
-                                       self.script,
-                                       flags = re.DOTALL)
+        ## Find the method declaration.
+        if self._method_start is _UNSET: self._scan_structure()
         
         ## If not found, it's a syntax error.
-        if not method_text_search: self.syntax_error("Method not found.")
+        if self._method_start == -1: self.syntax_error("Method not found.")
+        
+        ## The method runs up to the next blank line,
+        ##  or to the end of the script if there isn't one.
+        method_end = self.script.find("\n\n", self._method_start)
+        if method_end == -1: method_end = len(self.script)
         
         ## Create class attribute and return it
-        self._method_text = method_text_search.group(0)
+        self._method_text = self.script[self._method_start:method_end]
         
         return self._method_text
         
@@ -1416,16 +1918,61 @@ class Chef:
         """
         
         ## Have we already extracted the method?
-        if hasattr(self,"_method"): return self._method
+        if self._method is not _UNSET: return self._method
         
         
-        ## Extract the method steps as a list of strings,
-        ##  omitting the entries corresponding to the 'Method.' declaration
-        ##  and the final two newlines.
-        self._method = self.method_text.split('\n')[1:-2]
+        ## Extract the method steps as a list of strings.
+        ## The parsing itself is cached across Chefs; see _parse_method().
+        self._method = list(_parse_method(self.method_text))
         
         return self._method
     
+    @property
+    def program(self)->tuple:
+        """
+        Lazy instantiation of the decoded method.
+        Each line of the method is worked out once, up front,
+         so cooking only has to look up the line number.
+
+        Returns
+        -------
+        _program: tuple
+            One entry per line of the method:
+             (handler, groups) as returned by _decode_instruction(),
+             or None if the line is not a recognised instruction.
+            Unrecognised lines are only reported if they are reached.
+
+        """
+        
+        ## Have we already decoded the method?
+        if self._program is not _UNSET: return self._program
+        
+        self._program = tuple(map(self._decode_instruction, self.method))
+        
+        return self._program
+    
+    @property
+    def serves_count(self)->int:
+        """
+        Lazy instantiation of the number in the Serves statement.
+
+        Returns
+        -------
+        int
+            The number of baking dishes to serve when the recipe is finished.
+            The Serves statement is optional. If it doesn't exist, this is 0.
+
+        """
+        
+        ## Lazy instantiation
+        if self._serves_count is not _UNSET: return self._serves_count
+        
+        ## The Serves statement is found along with the other structural markers.
+        ## This stores the number of servings, or 0 if there is no Serves statement.
+        self._scan_structure()
+        
+        return self._serves_count
+    
     @property
     def has_multiple_bowls(self)->bool:
         """
@@ -1446,18 +1993,12 @@ class Chef:
         """
         
         ## Lazy instantiation
-        if hasattr(self,"_has_multiple_bowls"): return self._has_multiple_bowls
-        
-        ## Default to False
-        self._has_multiple_bowls = False
+        if self._has_multiple_bowls is not _UNSET: return self._has_multiple_bowls
         
-        ## Regex to see if a mixing bowl is referenced
+        ## See if a mixing bowl is referenced
         ##  that has an index greater than 1.
-        if re.search("(2nd|3rd|[0-9]+th) mixing bowl", self.script) != None:
-            
-            ## A bowl with index 2 or higher has been referenced,
-            ##  so this recipe has multiple bowls.
-            self._has_multiple_bowls = True
+        ## This is found along with the other structural markers.
+        self._scan_structure()
         
         return self._has_multiple_bowls
     
@@ -1481,18 +2022,12 @@ class Chef:
         """
         
         ## Lazy instantiation
-        if hasattr(self,"_has_multiple_dishes"): return self._has_multiple_dishes
-        
-        ## Default to False
-        self._has_multiple_dishes = False
+        if self._has_multiple_dishes is not _UNSET: return self._has_multiple_dishes
         
-        ## Regex to see if a baking dish is referenced
+        ## See if a baking dish is referenced
         ##  that has an index greater than 1.
-        if re.search("(2nd|3rd|[0-9]+th) baking dish", self.script) != None:
-            
-            ## A dish with index 2 or higher has been referenced,
-            ##  so this recipe has multiple dishes.
-            self._has_multiple_dishes = True
+        ## This is found along with the other structural markers.
+        self._scan_structure()
         
         return self._has_multiple_dishes
     
@@ -1522,78 +2057,88 @@ class Chef:
         Returns
         -------
         dict
-            keys are auxiliary recipe names,
-            values are dicts with {"script": <SCRIPT OF AUXILIARY RECIPE>}
+            keys are auxiliary recipe names in lower case,
+            values are dicts with {"name": <RECIPE NAME>, "script": <SCRIPT OF AUXILIARY RECIPE>}
 
         """
         
         ## Lazy instantiation
-        if hasattr(self,"_auxiliary_recipes"): return self._auxiliary_recipes
+        if self._auxiliary_recipes is not _UNSET: return self._auxiliary_recipes
         
         ## Default to empty list
         self._auxiliary_recipes = {}
         
-        ## Regex to see if auxiliary recipes exist.
-        ## Get a copy of the full script, start chopping it down, 
-        ##  pulling each auxiliary recipe's script into the dict as we go.
-        script_editable = copy.copy(self.script)
-        
-        ## Remove the current title.
-        script_editable = script_editable.replace(self.recipename,"")
-        
-        ## Remove the comment.
-        script_editable = script_editable.replace(self.comment,"")
-        
-        ## Remove the ingredients text.
-        script_editable = script_editable.replace(self.ingredients_text,"")
-        
-        ## Remove cooking time statement if it exists.
-        script_editable = re.sub("Cooking time:(.*)", "", script_editable)
-        
-        ## Remove Pre-heat oven statement if it exists.
-        script_editable = re.sub("Pre-heat oven(.*)", "", script_editable)
-        
-        ## Remove the method text.
-        script_editable = script_editable.replace(self.method_text,"")
-        
-        ## Remove the Serves statement if it exists.
-        script_editable = re.sub("Serves(.*)", "", script_editable)
-        
-        ## Left-strip.
-        script_editable = script_editable.lstrip()
-        
-        ## At this point we are just left with any auxiliary recipes there may be.
-        ## We will proceed on the assumption that auxiliary recipes don't have 
-        ##  comments, oven statements or Serves statements.
-        
-        ## If there is no text left at this point, there are no auxiliary recipes.
-        if script_editable == "": return self._auxiliary_recipes
-        
-        ## Split remaining text by each pair of newlines.
-        auxiliaries_raw = script_editable.split("\n\n")
-        
-        while len(auxiliaries_raw) > 0:
-            
-            ## First entry is the name of the auxiliary recipe.
-            ## Second entry is ingredients.
-            ## Third entry is method.
-            auxiliary_script = auxiliaries_raw[0] + "\n\n" +\
-                               auxiliaries_raw[1] + "\n\n" +\
-                               auxiliaries_raw[2] + "\n\n"
-            
-            ## Bundle everything together
-            self._auxiliary_recipes[auxiliaries_raw[0]] = {
-                "ingredients_text" : auxiliaries_raw[1],
-                "method_text" : auxiliaries_raw[2],
+        ## The auxiliary recipes start after the main recipe's method,
+        ##  so only that part of the script needs looking at.
+        if self._method_start is _UNSET: self._scan_structure()
+        auxiliary_text = self.script[self._method_start + len(self.method_text):]
+        
+        ## Items in a recipe are separated by blank lines, so we split
+        ##  the rest of the script into its sections once.
+        ## Surrounding whitespace is stripped and empty sections are dropped.
+        sections = [section.strip() for section in auxiliary_text.split("\n\n") if section.strip()]
+        
+        ## Every recipe, main or auxiliary, ends with its method,
+        ##  optionally followed by a Serves statement.
+        ## Starting from section <index>, find the index just past the end of that recipe.
+        def end_of_recipe(index):
+            while index < len(sections) and not sections[index].startswith("Method."):
+                index += 1
+            index += 1
+            if index < len(sections) and sections[index].startswith("Serves"):
+                index += 1
+            return index
+        
+        ## Skip the main recipe's Serves statement, if any.
+        index = 1 if sections and sections[0].startswith("Serves") else 0
+        
+        ## Everything after the main recipe is auxiliary recipes.
+        ## If there are no sections left, there are no auxiliary recipes.
+        while index < len(sections):
+            
+            ## The sections of this auxiliary recipe.
+            ## First entry is its name, and it runs up to and including its method
+            ##  (and Serves statement, if any).
+            ## In between there may be a comment, ingredients and oven statements.
+            start = index
+            index = end_of_recipe(start)
+            recipe_sections = sections[start:index]
+            
+            ## Reassemble the auxiliary recipe's script, so a sous-chef can cook it.
+            auxiliary_script = "\n\n".join(recipe_sections) + "\n\n"
+            
+            ## Bundle everything together.
+            ## The recipe is filed under its name in lower case,
+            ##  because `Serve with` may not match the case of the title.
+            self._auxiliary_recipes[recipe_sections[0].lower()] = {
+                "name" : recipe_sections[0],
+                "ingredients_text" : next((section for section in recipe_sections if section.startswith("Ingredients.")), ""),
+                "method_text" : next((section for section in recipe_sections if section.startswith("Method.")), ""),
                 "script" : auxiliary_script
                 }
-            
-            ## Remove these three entries from the list.
-            auxiliaries_raw = auxiliaries_raw[3:]
         
         return self._auxiliary_recipes
     
     
+def _read_script(fpath)->str:
+    """
+    Read the text of a Chef recipe from a file.
+    Shared by load() and the command line.
+
+    Parameters
+    ----------
+    fpath : string
+        Filepath of the Chef recipe.
+
+    Returns
+    -------
+    str
+        The recipe script.
+
+    """
+    
+    return pathlib.Path(fpath).read_text(encoding='utf-8')
+
 def load(fpath):
     """
     Load a recipe into a Chef object and return the object without parsing.
@@ -1610,14 +2155,20 @@ def load(fpath):
 
     """
     
-    with open(fpath, "r",encoding='utf-8') as f:
-        chef = Chef(f.read())
-    
-    return chef
+    return Chef(_read_script(fpath))
 
 if __name__ == "__main__":
+    
+    try:
+        ## The recipe file can be given on the command line.
+        main = Chef(_read_script(sys.argv[1] if len(sys.argv) > 1 else "recipes/cherrypi.chef"))
         
-    with open("recipes/cherrypi.chef", "r",encoding='utf-8') as f:
-        main = Chef(f.read())
+        ## The Chef parses lazily, and most syntax errors only show up
+        ##  when the offending line is reached, so cook inside the try.
+        main.cook()
     
-    # main.cook()
+    ## The recipe couldn't be read or understood.
+    ## Report it and exit with the same status as a runtime error.
+    except (OSError, ChefParseError) as error:
+        logger.error(error)
+        sys.exit(-1)